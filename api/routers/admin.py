@@ -0,0 +1,25 @@
+# api/routers/admin.py
+"""
+Defines administrative endpoints. Every route here requires the admin API key.
+"""
+import logging
+from fastapi import APIRouter, Depends
+from typing import Dict
+
+from ..dependencies import verify_admin_key
+from core.tools.web_search import clear_search_cache
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/api/admin",
+    tags=["Admin"],
+    dependencies=[Depends(verify_admin_key)]
+)
+
+
+@router.post("/cache/clear")
+async def clear_cache_endpoint() -> Dict[str, str]:
+    """Clears the web search cache in this worker and in Redis."""
+    await clear_search_cache()
+    return {"status": "ok", "message": "Web search cache cleared."}
@@ -27,7 +27,7 @@ async def chat_endpoint(request: ChatRequest):
     logger.info(f"Received streaming chat request for session_id: '{request.session_id}'")
 
     if request.session_id:
-        request.history = session_manager.get_history(request.session_id)
+        request.history = await session_manager.get_history(request.session_id)
 
     try:
         return StreamingResponse(
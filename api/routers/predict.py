@@ -2,6 +2,7 @@
 """
 Defines the FastAPI router for the machine learning prediction endpoint.
 """
+import asyncio
 import joblib
 import pandas as pd
 import logging
@@ -25,6 +26,12 @@ MODEL_FEATURE_BLUEPRINT = [
     'p1_age', 'p1_height', 'p1_plays_right_handed',
     'p2_age', 'p2_height', 'p2_plays_right_handed'
 ]
+SURFACES = ('Clay', 'Hard', 'Grass', 'Carpet')
+# Precomputed one-hot columns per surface, so encoding is a single dict lookup.
+SURFACE_ONE_HOT = {
+    surface: {f'surface_{s}': s == surface for s in SURFACES}
+    for surface in SURFACES
+}
 
 # --- Router Setup ---
 router = APIRouter(
@@ -65,15 +72,26 @@ def transform_to_feature_vector(data: MatchData) -> pd.DataFrame:
     feature_dict['rank_diff'] = feature_dict['p1_rank'] - feature_dict['p2_rank']
     feature_dict['points_diff'] = feature_dict['p1_points'] - feature_dict['p2_points']
 
-    feature_dict['surface_Clay'] = data.surface == 'Clay'
-    feature_dict['surface_Hard'] = data.surface == 'Hard'
-    feature_dict['surface_Grass'] = data.surface == 'Grass'
-    feature_dict['surface_Carpet'] = data.surface == 'Carpet'
+    feature_dict.update(SURFACE_ONE_HOT[data.surface])
 
-    df = pd.DataFrame([feature_dict])
+    # Build the single row positionally in blueprint order; this skips the
+    # dict-of-records path and the column reindex on every prediction.
+    row = [feature_dict[feature] for feature in MODEL_FEATURE_BLUEPRINT]
+    df = pd.DataFrame([row], columns=MODEL_FEATURE_BLUEPRINT)
     df.fillna(0, inplace=True)
 
-    return df[MODEL_FEATURE_BLUEPRINT]
+    return df
+
+
+def _predict_p1_win_probability(huge_request_body: Dict[str, Any]) -> float:
+    """
+    Runs the CPU-bound part of a prediction: parsing, feature engineering and inference.
+    Kept synchronous so it can be offloaded to a worker thread.
+    """
+    clean_match_data = parse_live_match_json(huge_request_body)
+    feature_vector = transform_to_feature_vector(clean_match_data)
+    prediction_probabilities = model.predict_proba(feature_vector)
+    return prediction_probabilities[0][1]
 
 
 # --- Prediction Endpoint ---
@@ -89,10 +107,8 @@ async def predict_match(huge_request_body: Dict[str, Any]) -> PredictionResponse
         )
 
     try:
-        clean_match_data = parse_live_match_json(huge_request_body)
-        feature_vector = transform_to_feature_vector(clean_match_data)
-        prediction_probabilities = model.predict_proba(feature_vector)
-        p1_win_probability = prediction_probabilities[0][1]
+        # Run off the event loop so other requests keep flowing during inference.
+        p1_win_probability = await asyncio.to_thread(_predict_p1_win_probability, huge_request_body)
 
         return PredictionResponse(
             predicted_winner="Player 1" if p1_win_probability > 0.5 else "Player 2",
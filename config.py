@@ -34,6 +34,11 @@ class Settings(BaseSettings):
     # --- NEW: Google Custom Search API Keys for the Web Search Tool ---
     google_search_api_key: Optional[str] = None
     google_cse_id: Optional[str] = None
+    google_search_max_concurrency: int = Field(
+        default=10,
+        ge=1,
+        description="Maximum number of Google Custom Search requests in flight per worker."
+    )
 
     # --- Other Keys & Settings ---
     admin_api_key: str
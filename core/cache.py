@@ -0,0 +1,202 @@
+# core/cache.py
+"""
+Caching helpers for async functions wrapping read-only upstream calls whose
+results change slowly.
+
+- `async_ttl_cache` keeps results in the worker's own memory.
+- `redis_cache` keeps them in Redis, shared by every worker and instance and
+  surviving restarts.
+
+They are meant to be stacked: in-process first, then Redis, then the upstream.
+"""
+import asyncio
+import functools
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+import orjson
+import redis.asyncio as redis_asyncio
+from redis.exceptions import RedisError
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def async_ttl_cache(
+    maxsize: int = 512,
+    ttl: float = 600,
+    key: Callable[..., Hashable] | None = None,
+):
+    """
+    Decorator that memoizes an async function's results for `ttl` seconds,
+    evicting the least recently used entry once `maxsize` is reached.
+
+    Concurrent calls for the same key share a single in-flight call
+    (single-flight), so a burst of identical requests reaches the upstream once.
+    The shared call runs in its own task, so a caller being cancelled (e.g. its
+    client disconnecting) neither cancels it nor the other callers waiting on it.
+    Exceptions are never cached; they propagate to every waiting caller.
+
+    The wrapped function gains a `cache_clear()` method.
+    """
+    def decorator(func):
+        cache: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        inflight: dict[Hashable, asyncio.Task] = {}
+
+        async def load(cache_key, args, kwargs):
+            try:
+                value = await func(*args, **kwargs)
+            finally:
+                inflight.pop(cache_key, None)
+
+            cache[cache_key] = (time.monotonic() + ttl, value)
+            if len(cache) > maxsize:
+                cache.popitem(last=False)
+            return value
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            cache_key = key(*args, **kwargs) if key else (args, tuple(sorted(kwargs.items())))
+
+            entry = cache.get(cache_key)
+            if entry is not None:
+                expires_at, value = entry
+                if time.monotonic() < expires_at:
+                    cache.move_to_end(cache_key)
+                    return value
+                del cache[cache_key]
+
+            task = inflight.get(cache_key)
+            if task is None:
+                task = asyncio.create_task(load(cache_key, args, kwargs))
+                # If every caller was cancelled, nobody awaits a failure; mark it
+                # retrieved so asyncio doesn't log it as unhandled.
+                task.add_done_callback(lambda t: t.cancelled() or t.exception())
+                inflight[cache_key] = task
+            return await asyncio.shield(task)
+
+        def cache_clear():
+            cache.clear()
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+
+    return decorator
+
+
+# --- Redis Cache ---
+# Short socket timeouts so a stalled or partitioned Redis degrades into cache
+# misses instead of holding every call until the OS gives up on the socket.
+REDIS_CACHE_SOCKET_TIMEOUT_SECONDS = 0.5
+
+_redis = redis_asyncio.from_url(
+    settings.redis_url,
+    socket_connect_timeout=REDIS_CACHE_SOCKET_TIMEOUT_SECONDS,
+    socket_timeout=REDIS_CACHE_SOCKET_TIMEOUT_SECONDS,
+)
+
+# While one worker recomputes a missing value, others poll for it instead of
+# also hitting the upstream (dogpile protection).
+REDIS_LOCK_TIMEOUT_MS = 15000
+REDIS_LOCK_POLL_INTERVAL_SECONDS = 0.1
+REDIS_LOCK_MAX_WAIT_SECONDS = 5
+
+
+def _decode(key: str, cached: bytes | None) -> Any | None:
+    """Decodes a cached value, treating a corrupt entry as a miss."""
+    if cached is None:
+        return None
+    try:
+        return orjson.loads(cached)
+    except orjson.JSONDecodeError as e:
+        logger.warning("Discarding undecodable Redis cache entry '%s': %s", key, e)
+        return None
+
+
+async def _redis_get(key: str) -> Any | None:
+    """Reads and decodes a cached value, treating Redis errors as a miss."""
+    try:
+        cached = await _redis.get(key)
+    except RedisError as e:
+        logger.warning("Redis cache read failed for '%s': %s", key, e)
+        return None
+    return _decode(key, cached)
+
+
+def redis_cache(prefix: str, ttl: int, key: Callable[..., str]):
+    """
+    Decorator that memoizes an async function's JSON-serialisable results in
+    Redis for `ttl` seconds under `{prefix}:{key(*args, **kwargs)}`.
+
+    Concurrent misses across workers are coalesced with a `SET NX PX` lock;
+    waiters stop polling as soon as the lock is released without a value.
+    Redis being unavailable never fails the call; it just bypasses the cache.
+    Exceptions are never cached.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            cache_key = f"{prefix}:{key(*args, **kwargs)}"
+            lock_key = f"{cache_key}:lock"
+
+            cached = await _redis_get(cache_key)
+            if cached is not None:
+                return cached
+
+            try:
+                has_lock = await _redis.set(lock_key, "1", nx=True, px=REDIS_LOCK_TIMEOUT_MS)
+            except RedisError as e:
+                logger.warning("Redis cache lock failed for '%s': %s", cache_key, e)
+                has_lock = False
+            else:
+                if not has_lock:
+                    waited = 0.0
+                    while waited < REDIS_LOCK_MAX_WAIT_SECONDS:
+                        await asyncio.sleep(REDIS_LOCK_POLL_INTERVAL_SECONDS)
+                        waited += REDIS_LOCK_POLL_INTERVAL_SECONDS
+                        try:
+                            async with _redis.pipeline(transaction=False) as pipe:
+                                cached, lock_held = await pipe.get(cache_key).exists(lock_key).execute()
+                        except RedisError as e:
+                            logger.warning("Redis cache poll failed for '%s': %s", cache_key, e)
+                            break
+                        cached = _decode(cache_key, cached)
+                        if cached is not None:
+                            return cached
+                        if not lock_held:
+                            # The holder finished without storing a value (it failed),
+                            # so compute it here rather than waiting out the timeout.
+                            break
+
+            try:
+                value = await func(*args, **kwargs)
+                try:
+                    await _redis.set(cache_key, orjson.dumps(value), ex=ttl)
+                except RedisError as e:
+                    logger.warning("Redis cache write failed for '%s': %s", cache_key, e)
+                return value
+            finally:
+                if has_lock:
+                    try:
+                        await _redis.delete(lock_key)
+                    except RedisError:
+                        # The lock expires on its own after REDIS_LOCK_TIMEOUT_MS.
+                        pass
+
+        return wrapper
+
+    return decorator
+
+
+async def clear_redis_cache(prefix: str):
+    """Deletes every Redis cache entry stored under `prefix`."""
+    async for cache_key in _redis.scan_iter(match=f"{prefix}:*"):
+        await _redis.delete(cache_key)
+
+
+async def close_redis_cache():
+    """Closes the Redis cache connection pool. Called on application shutdown."""
+    await _redis.aclose()
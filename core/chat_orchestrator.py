@@ -37,7 +37,7 @@ async def process_chat_request_stream(request: ChatRequest) -> AsyncGenerator[st
         # If a session_id was provided, save the user query and the full model response
         if request.session_id:
             logger.info(f"Saving full conversation turn to Redis for session_id: '{request.session_id}'")
-            session_manager.update_history(
+            await session_manager.update_history(
                 session_id=request.session_id,
                 user_query=user_message,
                 model_response_content=final_response_content,
@@ -5,16 +5,21 @@ sent by the client into a clean, validated Pydantic model that the rest of
 the application can use.
 """
 import logging
-from typing import Dict, Any
-from datetime import datetime
+from typing import Dict, Any, Mapping
+from datetime import date
+from types import MappingProxyType
 # --- IMPORT HAS CHANGED ---
 # Import the data contracts from their new, central location
 from schemas.predict_schemas import MatchData, PlayerData
 
 logger = logging.getLogger(__name__)
 
+# Shared read-only default for nested .get() chains, so a missing section
+# doesn't allocate a fresh empty dict on every lookup.
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
 # ... (the rest of the file is IDENTICAL) ...
-def _find_official_ranking(rankings_list: list) -> Dict[str, Any]:
+def _find_official_ranking(rankings_list: list) -> Mapping[str, Any]:
     """
     Searches the list of rankings for the official ATP ranking (type 5).
     """
@@ -23,14 +28,14 @@ def _find_official_ranking(rankings_list: list) -> Dict[str, Any]:
             return ranking_data
     if rankings_list:
         return rankings_list[0]
-    return {}
+    return _EMPTY
 
 def _calculate_age(timestamp: int | None) -> float | None:
     """Calculates age in years from a UNIX timestamp."""
     if timestamp is None:
         return None
-    birth_date = datetime.fromtimestamp(timestamp)
-    today = datetime.now()
+    birth_date = date.fromtimestamp(timestamp)
+    today = date.today()
     age = today.year - birth_date.year - ((today.month, today.day) < (birth_date.month, birth_date.day))
     return age
 
@@ -45,48 +50,40 @@ def _normalize_surface(ground_type: str) -> str:
         return 'Carpet'
     return 'Hard'
 
+def _parse_player(huge_json: Dict[str, Any], player_id: str) -> PlayerData:
+    """Extracts one player's ranking and profile from the per-player sections of the client JSON."""
+    details_json = huge_json.get(f"Player Details - {player_id}", _EMPTY)
+    rankings_json = huge_json.get(f"Player Raking's- {player_id}", _EMPTY)
+    team_info = details_json.get('team', _EMPTY).get('playerTeamInfo', _EMPTY)
+    official_rank = _find_official_ranking(rankings_json.get('rankings', ()))
+
+    return PlayerData(
+        rank=official_rank.get('ranking'),
+        points=official_rank.get('points'),
+        age=_calculate_age(team_info.get('birthDateTimestamp')),
+        height=int(team_info.get('height', 0) * 100),
+        plays_right_handed='right' in team_info.get('plays', '').lower()
+    )
+
 def parse_live_match_json(huge_json: Dict[str, Any]) -> MatchData:
     """
     Navigates the massive client JSON to extract the specific fields needed for prediction.
     """
     logger.info("Starting to parse the huge incoming JSON blob with known schema...")
     try:
-        event_data = huge_json.get('event', {})
+        event_data = huge_json.get('event', _EMPTY)
         if not event_data:
-            event_data = huge_json.get('Event', {})
+            event_data = huge_json.get('Event', _EMPTY)
 
-        p1_id = str(event_data.get('homeTeam', {}).get('id'))
-        p2_id = str(event_data.get('awayTeam', {}).get('id'))
+        p1_id = str(event_data.get('homeTeam', _EMPTY).get('id'))
+        p2_id = str(event_data.get('awayTeam', _EMPTY).get('id'))
 
         if not all([p1_id, p2_id]):
             raise ValueError("Could not find player IDs in the 'event.homeTeam' or 'event.awayTeam' section.")
         logger.info(f"Found Player 1 ID: {p1_id}, Player 2 ID: {p2_id}")
 
-        p1_details_json = huge_json.get(f"Player Details - {p1_id}", {})
-        p1_rankings_json = huge_json.get(f"Player Raking's- {p1_id}", {})
-        p1_team_info = p1_details_json.get('team', {}).get('playerTeamInfo', {})
-        p1_official_rank = _find_official_ranking(p1_rankings_json.get('rankings', []))
-
-        player1 = PlayerData(
-            rank=p1_official_rank.get('ranking'),
-            points=p1_official_rank.get('points'),
-            age=_calculate_age(p1_team_info.get('birthDateTimestamp')),
-            height=int(p1_team_info.get('height', 0) * 100),
-            plays_right_handed='right' in p1_team_info.get('plays', '').lower()
-        )
-
-        p2_details_json = huge_json.get(f"Player Details - {p2_id}", {})
-        p2_rankings_json = huge_json.get(f"Player Raking's- {p2_id}", {})
-        p2_team_info = p2_details_json.get('team', {}).get('playerTeamInfo', {})
-        p2_official_rank = _find_official_ranking(p2_rankings_json.get('rankings', []))
-
-        player2 = PlayerData(
-            rank=p2_official_rank.get('ranking'),
-            points=p2_official_rank.get('points'),
-            age=_calculate_age(p2_team_info.get('birthDateTimestamp')),
-            height=int(p2_team_info.get('height', 0) * 100),
-            plays_right_handed='right' in p2_team_info.get('plays', '').lower()
-        )
+        player1 = _parse_player(huge_json, p1_id)
+        player2 = _parse_player(huge_json, p2_id)
 
         ground_type_str = event_data.get('groundType', 'Hard')
         surface = _normalize_surface(ground_type_str)
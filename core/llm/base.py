@@ -7,6 +7,9 @@ from abc import ABC, abstractmethod
 from typing import List, AsyncGenerator
 from schemas.chat_schemas import ChatMessage
 
+# History roles that denote the assistant; anything else is treated as the user.
+MODEL_ROLES = frozenset({"assistant", "model"})
+
 
 class LLMService(ABC):
     """Abstract base class for a language model service."""
@@ -1,16 +1,24 @@
 # core/llm/deepseek_service.py
+import asyncio
 import logging
-import json
+import orjson
 from typing import List, AsyncGenerator
 from openai import AsyncOpenAI
 
-from .base import LLMService
+from .base import LLMService, MODEL_ROLES
 from config import settings
 from schemas.chat_schemas import ChatMessage
-from core.tools.web_search import google_search, SEARCH_TOOL_SCHEMA
+from core.tools.web_search import google_search, OPENAI_SEARCH_TOOL
 
 logger = logging.getLogger(__name__)
 
+# Built once at import; these are identical for every request.
+SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are a world-class tennis expert. Use the `web_search` tool to find current information to answer user questions."
+}
+TOOLS = [OPENAI_SEARCH_TOOL]
+
 
 class DeepSeekService(LLMService):
     """LLM Service for DeepSeek, with streaming and tool-calling."""
@@ -28,15 +36,31 @@ class DeepSeekService(LLMService):
 
     def _convert_history(self, history: List[ChatMessage]) -> List[dict]:
         """Converts internal ChatMessage format to OpenAI's message format."""
-        messages = [{
-            "role": "system",
-            "content": "You are a world-class tennis expert. Use the `web_search` tool to find current information to answer user questions."
-        }]
+        messages = [SYSTEM_MESSAGE]
         for msg in history:
-            role = "assistant" if msg.role.lower() in ["assistant", "model"] else "user"
+            role = "assistant" if msg.role.lower() in MODEL_ROLES else "user"
             messages.append({"role": role, "content": msg.content})
         return messages
 
+    async def _run_tool_call(self, tool_call) -> dict:
+        """Executes a single tool call and returns the `tool` message to send back to the model."""
+        function_name = tool_call.function.name
+        if function_name != "web_search":
+            tool_response_content = f"Unknown tool: {function_name}"
+        else:
+            try:
+                arguments = orjson.loads(tool_call.function.arguments)
+                search_query = arguments.get("query")
+                logger.info("DeepSeek requested tool call: web_search(query=%r)", search_query)
+                tool_response_content = await google_search(search_query)
+            except orjson.JSONDecodeError:
+                tool_response_content = "I had an issue understanding what to search for."
+
+        return {
+            "tool_call_id": tool_call.id, "role": "tool",
+            "name": function_name, "content": tool_response_content,
+        }
+
     async def generate_response_async(self, query: str, history: List[ChatMessage]) -> AsyncGenerator[str, None]:
         """Generates a streaming response, handling the tool-calling loop."""
         messages = self._convert_history(history)
@@ -46,7 +70,7 @@ class DeepSeekService(LLMService):
         first_response = await self.client.chat.completions.create(
             model=self.model_name,
             messages=messages,
-            tools=[{"type": "function", "function": SEARCH_TOOL_SCHEMA}]
+            tools=TOOLS
         )
         response_message = first_response.choices[0].message
         messages.append(response_message)
@@ -55,23 +79,12 @@ class DeepSeekService(LLMService):
         stream_request_messages = messages
 
         if response_message.tool_calls:
-            tool_call = response_message.tool_calls[0]
-            if tool_call.function.name == "web_search":
-                try:
-                    arguments = json.loads(tool_call.function.arguments)
-                    search_query = arguments.get("query")
-                except json.JSONDecodeError:
-                    yield "I had an issue understanding what to search for."
-                    return
-
-                logger.info(f"DeepSeek requested tool call: web_search(query='{search_query}')")
-                tool_response_content = await google_search(search_query)
-
-                # Prepare the messages for the final streaming call
-                stream_request_messages.append({
-                    "tool_call_id": tool_call.id, "role": "tool",
-                    "name": "web_search", "content": tool_response_content,
-                })
+            # The model may request several searches at once; run them concurrently
+            # and answer every tool_call_id, as the API requires.
+            tool_messages = await asyncio.gather(
+                *(self._run_tool_call(tool_call) for tool_call in response_message.tool_calls)
+            )
+            stream_request_messages.extend(tool_messages)
 
         # The final call is ALWAYS a streaming call.
         stream = await self.client.chat.completions.create(
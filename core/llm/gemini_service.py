@@ -1,16 +1,23 @@
 # core/llm/gemini_service.py
+import asyncio
 import logging
 from typing import List, Dict, Any, AsyncGenerator
 import google.generativeai as genai
 from google.generativeai import protos
 
-from .base import LLMService
+from .base import LLMService, MODEL_ROLES
 from config import settings
 from schemas.chat_schemas import ChatMessage
 from core.tools.web_search import google_search, SEARCH_TOOL_SCHEMA
 
 logger = logging.getLogger(__name__)
 
+MODEL_NAME = "gemini-1.5-flash"
+
+SYSTEM_INSTRUCTION = """You are a world-class tennis expert. Your primary goal is to answer user questions about tennis.
+        To do this, you MUST use the provided `web_search` tool to find the most current and accurate information.
+        After getting the search results, synthesize them into a comprehensive and friendly answer."""
+
 
 class GeminiService(LLMService):
     """LLM Service for Google Gemini, with streaming and tool-calling."""
@@ -21,14 +28,10 @@ class GeminiService(LLMService):
 
         genai.configure(api_key=settings.google_api_key)
 
-        system_instruction = """You are a world-class tennis expert. Your primary goal is to answer user questions about tennis.
-        To do this, you MUST use the provided `web_search` tool to find the most current and accurate information.
-        After getting the search results, synthesize them into a comprehensive and friendly answer."""
-
         # The model is now initialized with the FunctionDeclaration object.
         self.model = genai.GenerativeModel(
-            model_name="gemini-1.5-flash",
-            system_instruction=system_instruction,
+            model_name=MODEL_NAME,
+            system_instruction=SYSTEM_INSTRUCTION,
             tools=[SEARCH_TOOL_SCHEMA]
         )
         logger.info("Google Gemini service initialized in TOOL-CALLING mode.")
@@ -37,10 +40,26 @@ class GeminiService(LLMService):
         """Converts internal ChatMessage format to Gemini's format."""
         gemini_history = []
         for msg in history:
-            role = "model" if msg.role.lower() in ["assistant", "model"] else "user"
+            role = "model" if msg.role.lower() in MODEL_ROLES else "user"
             gemini_history.append({"role": role, "parts": [msg.content]})
         return gemini_history
 
+    async def _run_function_call(self, function_call: protos.FunctionCall) -> protos.Part:
+        """Executes a single function call and wraps its result as a FunctionResponse part."""
+        if function_call.name == "web_search":
+            search_query = function_call.args.get('query')
+            logger.info("Gemini requested tool call: web_search(query=%r)", search_query)
+            tool_response_content = await google_search(search_query)
+        else:
+            tool_response_content = f"Unknown tool: {function_call.name}"
+
+        return protos.Part(
+            function_response=protos.FunctionResponse(
+                name=function_call.name,
+                response={'result': tool_response_content}
+            )
+        )
+
     async def generate_response_async(self, query: str, history: List[ChatMessage]) -> AsyncGenerator[str, None]:
         """Generates a streaming response, handling the tool-calling loop."""
         gemini_history = self._convert_history(history)
@@ -49,34 +68,30 @@ class GeminiService(LLMService):
         response = await chat.send_message_async(query)
 
         try:
-            function_call = response.candidates[0].content.parts[0].function_call
-
-            if function_call.name == "web_search":
-                search_query = function_call.args['query']
-                logger.info(f"Gemini requested tool call: web_search(query='{search_query}')")
-
-                tool_response_content = await google_search(search_query)
-
-                response_part = protos.Part(
-                    function_response=protos.FunctionResponse(
-                        name='web_search',
-                        response={'result': tool_response_content}
-                    )
+            function_calls = [
+                part.function_call
+                for part in response.candidates[0].content.parts
+                if part.function_call.name
+            ]
+
+            if function_calls:
+                # Gemini may request several searches in one turn; run them concurrently.
+                response_parts = await asyncio.gather(
+                    *(self._run_function_call(function_call) for function_call in function_calls)
                 )
 
                 final_response_stream = await chat.send_message_async(
-                    response_part,
+                    list(response_parts),
                     stream=True
                 )
 
                 async for chunk in final_response_stream:
                     if chunk.text:
                         yield chunk.text
+            elif response.text:
+                yield response.text
             else:
-                yield "I'm sorry, I tried to use an unknown tool."
+                yield "I'm sorry, I could not generate a response."
 
         except (ValueError, AttributeError, IndexError):
-            if response.text:
-                yield response.text
-            else:
-                yield "I'm sorry, I could not generate a response."
\ No newline at end of file
+            yield "I'm sorry, I could not generate a response."
@@ -2,9 +2,14 @@
 """
 Defines the web search tool for the LLM.
 """
+import asyncio
 import logging
+import random
+import time
 import httpx
+import orjson
 from config import settings
+from core.cache import async_ttl_cache, clear_redis_cache, redis_cache
 
 # --- THIS IS THE CORRECT IMPORT AND IMPLEMENTATION ---
 # The required classes are in the 'protos' module.
@@ -12,67 +17,365 @@ from google.generativeai import protos
 
 logger = logging.getLogger(__name__)
 
-# This schema is now built using the correct, verified proto classes.
+# The tool is described once as a plain JSON schema; each provider's format is
+# emitted from this single definition.
+SEARCH_TOOL_NAME = "web_search"
+SEARCH_TOOL_DESCRIPTION = "Searches the web for up-to-date information on a given topic, especially for recent tennis matches, player rankings, or news."
+SEARCH_TOOL_PARAMETERS = {
+    "type": "object",
+    "properties": {
+        "query": {"type": "string", "description": "The precise search query to use."}
+    },
+    "required": ["query"]
+}
+
+
+def _to_proto_schema(schema: dict) -> protos.Schema:
+    """Converts a JSON-schema dict into Gemini's proto Schema."""
+    return protos.Schema(
+        type=protos.Type[schema["type"].upper()],
+        description=schema.get("description", ""),
+        properties={name: _to_proto_schema(prop) for name, prop in schema.get("properties", {}).items()},
+        required=schema.get("required", [])
+    )
+
+
 # The FunctionDeclaration must be wrapped inside a protos.Tool object.
 SEARCH_TOOL_SCHEMA = protos.Tool(
     function_declarations=[
         protos.FunctionDeclaration(
-            name="web_search",
-            description="Searches the web for up-to-date information on a given topic, especially for recent tennis matches, player rankings, or news.",
-            parameters=protos.Schema(
-                type=protos.Type.OBJECT,
-                properties={
-                    "query": protos.Schema(type=protos.Type.STRING, description="The precise search query to use.")
-                },
-                required=["query"]
-            )
+            name=SEARCH_TOOL_NAME,
+            description=SEARCH_TOOL_DESCRIPTION,
+            parameters=_to_proto_schema(SEARCH_TOOL_PARAMETERS)
         )
     ]
 )
 
+# The same tool in the OpenAI-compatible format used by DeepSeek.
+OPENAI_SEARCH_TOOL = {
+    "type": "function",
+    "function": {
+        "name": SEARCH_TOOL_NAME,
+        "description": SEARCH_TOOL_DESCRIPTION,
+        "parameters": SEARCH_TOOL_PARAMETERS
+    }
+}
 
-async def google_search(query: str) -> str:
+# --- Shared HTTP Client ---
+# One pooled client keeps connections to Google open between searches instead of
+# paying a new TCP+TLS handshake on every tool call. It is created lazily so it
+# binds to the running event loop.
+SEARCH_API_BASE_URL = "https://www.googleapis.com"
+SEARCH_API_PATH = "/customsearch/v1"
+# A results page is a few tens of KB; anything far larger is rejected unparsed.
+SEARCH_MAX_RESPONSE_BYTES = 1_000_000
+# Upstream payloads included in log lines are cut to this many characters.
+LOG_EXCERPT_MAX_LENGTH = 500
+# Custom Search rejects longer queries, so they are refused before any I/O.
+SEARCH_MAX_QUERY_LENGTH = 2048
+
+_client: httpx.AsyncClient | None = None
+_warmup_task: asyncio.Task | None = None
+# Caps concurrent searches so parallel tool calls can't trip CSE rate limits.
+_SEARCH_SEMAPHORE = asyncio.Semaphore(settings.google_search_max_concurrency)
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Returns the shared HTTP client, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            base_url=SEARCH_API_BASE_URL,
+            # Parameters that never change are bound to the client once; each
+            # search only adds its query string.
+            params={
+                'key': settings.google_search_api_key,
+                'cx': settings.google_cse_id,
+                'num': 5,
+                # Partial response: Google drops everything except the fields we format,
+                # so the payload shrinks and orjson has far less to decode.
+                'fields': 'items(title,link,snippet)'
+            },
+            http2=True,
+            # Fail fast on an unreachable host, but give slow result pages time.
+            timeout=httpx.Timeout(15, connect=5),
+            # With HTTP/2, concurrent searches share streams on one connection, so
+            # the pool never needs more sockets than the concurrency cap. Idle
+            # connections are kept for 30s, long enough to bridge a chat turn.
+            limits=httpx.Limits(
+                max_connections=settings.google_search_max_concurrency,
+                max_keepalive_connections=8,
+                keepalive_expiry=30
+            )
+        )
+    return _client
+
+
+async def _preconnect():
+    """Sends a bare HEAD to the API host so a connection is left in the pool."""
+    # Sent as a standalone request: client.send() doesn't merge the client's
+    # default params, so the API key and engine ID stay out of this URL.
+    request = httpx.Request("HEAD", SEARCH_API_BASE_URL)
+    try:
+        response = await _get_client().send(request)
+        await response.aclose()
+    except httpx.HTTPError as e:
+        # Not fatal: the first search simply connects on its own.
+        logger.warning("Could not pre-connect to Google Search: %s", e)
+
+
+def warm_search_client():
     """
-    Performs a Google search using the Custom Search API and returns formatted results.
+    Opens a pooled connection to Google in the background so a search arriving
+    soon after startup skips DNS, TCP and TLS setup. Called on application
+    startup; it returns immediately, so an unreachable Google never delays boot.
+    The connection only survives the pool's keepalive_expiry (30s) if idle, so
+    this helps only searches that arrive within that window.
     """
+    global _warmup_task
     if not settings.google_search_api_key or not settings.google_cse_id:
-        logger.warning("Google Search API keys are not configured. Search tool is disabled.")
-        return "Search is not available because the API keys are not configured."
+        return
+    _warmup_task = asyncio.create_task(_preconnect())
 
-    url = "https://www.googleapis.com/customsearch/v1"
-    params = {
-        'key': settings.google_search_api_key,
-        'cx': settings.google_cse_id,
-        'q': query,
-        'num': 5
-    }
 
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, params=params)
+async def close_search_client():
+    """Closes the shared HTTP client. Called on application shutdown."""
+    global _client
+    if _warmup_task is not None and not _warmup_task.done():
+        _warmup_task.cancel()
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+# Formatting for a single search result handed back to the LLM.
+_RESULT_TEMPLATE = "Result {i}:\nTitle: {title}\nLink: {link}\nSnippet: {snippet}\n"
+# Snippets arrive hard-wrapped; line breaks and tabs inside them would break the
+# template's one-field-per-line layout, so they are flattened in a single pass.
+_SNIPPET_WHITESPACE_TABLE = str.maketrans({"\n": " ", "\r": " ", "\t": " "})
+
+# --- Result Cache ---
+# Search results change slowly, and chat users repeat the same questions, so
+# identical queries are answered from this worker's memory, then from Redis
+# (shared by all workers), before Google is called.
+SEARCH_CACHE_TTL_SECONDS = 600
+SEARCH_CACHE_MAXSIZE = 512
+SEARCH_CACHE_REDIS_PREFIX = "web_search"
+
+# --- Circuit Breaker ---
+# After BREAKER_FAIL_MAX consecutive failures the breaker opens and searches fail
+# fast for BREAKER_RESET_SECONDS instead of each one waiting on a dead upstream.
+# After that window a single search is let through as a probe (half-open); the
+# rest keep failing fast until it succeeds, which closes the breaker, or fails,
+# which reopens it. Only rate limiting, server errors and transport failures
+# count: a 4xx caused by the request itself says nothing about Google's health.
+BREAKER_FAIL_MAX = 5
+BREAKER_RESET_SECONDS = 30
+
+_consecutive_failures = 0
+_breaker_open_until = 0.0
+_probe_in_flight = False
+
+# --- Retries ---
+# Rate limiting and transient server errors are retried with capped, jittered
+# exponential backoff so concurrent searches don't retry in lock-step. A
+# Retry-After longer than the cap means the user's turn isn't worth holding.
+SEARCH_MAX_ATTEMPTS = 3
+SEARCH_RETRY_BASE_DELAY_SECONDS = 0.2
+SEARCH_RETRY_MAX_DELAY_SECONDS = 2.0
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def _record_search_failure():
+    """Counts a failed search and opens the breaker once the threshold is reached."""
+    global _consecutive_failures, _breaker_open_until
+    _consecutive_failures += 1
+    if _consecutive_failures >= BREAKER_FAIL_MAX:
+        _breaker_open_until = time.monotonic() + BREAKER_RESET_SECONDS
+        logger.warning(
+            "Google Search circuit breaker opened after %d consecutive failures. Failing fast for %ds.",
+            _consecutive_failures, BREAKER_RESET_SECONDS
+        )
+
+
+def _record_search_success():
+    """Closes the breaker after a successful search."""
+    global _consecutive_failures
+    if _consecutive_failures >= BREAKER_FAIL_MAX:
+        logger.info("Google Search circuit breaker closed.")
+    _consecutive_failures = 0
+
+
+def _is_upstream_failure(error: httpx.HTTPError) -> bool:
+    """Whether an error points at an unhealthy upstream rather than a bad request."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(error, httpx.TransportError)
+
+
+def _log_excerpt(text: str, max_length: int = LOG_EXCERPT_MAX_LENGTH) -> str:
+    """Truncates upstream payloads so a huge error body cannot flood the logs."""
+    if len(text) <= max_length:
+        return text
+    return f"{text[:max_length]}...(truncated {len(text) - max_length} chars)"
+
+
+class _CircuitOpenError(Exception):
+    """Raised when a search is skipped because the circuit breaker is open."""
+
+
+def _normalize_query(query: str) -> str:
+    """Builds the cache key for a query: case- and whitespace-insensitive."""
+    return " ".join(query.lower().split())
+
+
+def _retry_delay(error: httpx.HTTPError, attempt: int) -> float | None:
+    """
+    Returns how long to wait before retrying a failed search, or None if the
+    error is not transient or the attempts are used up.
+    """
+    if attempt >= SEARCH_MAX_ATTEMPTS or not _is_upstream_failure(error):
+        return None
+
+    if isinstance(error, httpx.HTTPStatusError):
+        retry_after = error.response.headers.get("retry-after")
+        if retry_after is not None:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                # An HTTP-date; fall back to our own backoff.
+                pass
+            else:
+                return delay if delay <= SEARCH_RETRY_MAX_DELAY_SECONDS else None
+    elif isinstance(error, httpx.TimeoutException):
+        # A timeout has already cost the full client timeout; don't repeat it.
+        return None
+
+    backoff = min(SEARCH_RETRY_MAX_DELAY_SECONDS, SEARCH_RETRY_BASE_DELAY_SECONDS * 2 ** (attempt - 1))
+    return random.uniform(0, backoff)
+
+
+async def _read_capped(response: httpx.Response, limit: int) -> bytes:
+    """Reads a streamed response body, aborting as soon as it exceeds `limit` bytes."""
+    declared_length = response.headers.get("content-length")
+    if declared_length is not None and int(declared_length) > limit:
+        raise ValueError(f"Search response of {declared_length} bytes exceeds the {limit} byte limit.")
+
+    body = bytearray()
+    async for chunk in response.aiter_bytes():
+        body += chunk
+        if len(body) > limit:
+            raise ValueError(f"Search response exceeds the {limit} byte limit.")
+    return bytes(body)
+
+
+async def _fetch_search(query: str) -> bytes:
+    """Sends one Custom Search request and returns the raw response body."""
+    async with _SEARCH_SEMAPHORE:
+        async with _get_client().stream("GET", SEARCH_API_PATH, params={'q': query}) as response:
+            if response.is_error:
+                # Load the (small) error body so it can be logged by the caller.
+                await response.aread()
             response.raise_for_status()
+            return await _read_capped(response, SEARCH_MAX_RESPONSE_BYTES)
 
-        search_results = response.json()
-        items = search_results.get("items", [])
 
-        if not items:
-            return "No relevant results found on the web for that query."
+@async_ttl_cache(maxsize=SEARCH_CACHE_MAXSIZE, ttl=SEARCH_CACHE_TTL_SECONDS, key=_normalize_query)
+@redis_cache(prefix=SEARCH_CACHE_REDIS_PREFIX, ttl=SEARCH_CACHE_TTL_SECONDS, key=_normalize_query)
+async def _cached_search(query: str) -> str:
+    """
+    Runs a Custom Search request, retrying transient failures, and formats the
+    results. Only successful searches are cached; errors propagate to `google_search`.
+    """
+    global _probe_in_flight
+    is_probe = False
+    if _consecutive_failures >= BREAKER_FAIL_MAX:
+        if time.monotonic() < _breaker_open_until or _probe_in_flight:
+            raise _CircuitOpenError()
+        _probe_in_flight = is_probe = True
 
-        formatted_results = []
-        for i, item in enumerate(items):
-            result = (
-                f"Result {i + 1}:\n"
-                f"Title: {item.get('title', 'N/A')}\n"
-                f"Link: {item.get('link', 'N/A')}\n"
-                f"Snippet: {item.get('snippet', 'N/A')}\n"
-            )
-            formatted_results.append(result)
+    try:
+        for attempt in range(1, SEARCH_MAX_ATTEMPTS + 1):
+            try:
+                content = await _fetch_search(query)
+                break
+            except httpx.HTTPError as e:
+                delay = _retry_delay(e, attempt)
+                if delay is None:
+                    if _is_upstream_failure(e):
+                        _record_search_failure()
+                    raise
+                logger.warning(
+                    "Google Search attempt %d/%d failed (%s); retrying in %.2fs.",
+                    attempt, SEARCH_MAX_ATTEMPTS, e, delay
+                )
+                await asyncio.sleep(delay)
+    finally:
+        if is_probe:
+            _probe_in_flight = False
+    _record_search_success()
+
+    # orjson parses the raw bytes directly, skipping the str decode and the slower stdlib parser.
+    search_results = orjson.loads(content)
+    items = search_results.get("items", [])
 
-        return "\n---\n".join(formatted_results)
+    if not items:
+        return "No relevant results found on the web for that query."
 
+    return "\n---\n".join(
+        _RESULT_TEMPLATE.format(
+            i=i,
+            title=item.get('title', 'N/A'),
+            link=item.get('link', 'N/A'),
+            snippet=item.get('snippet', 'N/A').translate(_SNIPPET_WHITESPACE_TABLE)
+        )
+        for i, item in enumerate(items, start=1)
+    )
+
+
+async def clear_search_cache():
+    """
+    Drops every cached search result from this worker and from Redis.
+    Other workers' in-memory entries expire on their own TTL.
+    """
+    _cached_search.cache_clear()
+    await clear_redis_cache(SEARCH_CACHE_REDIS_PREFIX)
+    logger.info("Web search cache cleared.")
+
+
+async def google_search(query: str) -> str:
+    """
+    Performs a Google search using the Custom Search API and returns formatted results.
+    A query is answered from this worker's in-memory cache first, then from the
+    Redis cache shared by all workers, and only then from Google.
+    """
+    if not settings.google_search_api_key or not settings.google_cse_id:
+        logger.warning("Google Search API keys are not configured. Search tool is disabled.")
+        return "Search is not available because the API keys are not configured."
+
+    # Tool-call arguments come from the model and aren't guaranteed to be a string.
+    query = query.strip() if isinstance(query, str) else ""
+    if not query:
+        return "No search was performed because the query was empty."
+    if len(query) > SEARCH_MAX_QUERY_LENGTH:
+        logger.warning("Refusing oversized search query of %d characters.", len(query))
+        return f"No search was performed because the query exceeds {SEARCH_MAX_QUERY_LENGTH} characters."
+
+    try:
+        return await _cached_search(query)
+
+    except _CircuitOpenError:
+        logger.warning("Google Search circuit breaker is open. Skipping the request.")
+        return "Search temporarily unavailable."
     except httpx.HTTPStatusError as e:
-        logger.error(f"HTTP error occurred during Google Search: {e.response.text}")
+        logger.error(
+            "HTTP error occurred during Google Search: %s", _log_excerpt(e.response.text)
+        )
         return f"An error occurred while searching: HTTP {e.response.status_code}"
-    except Exception as e:
-        logger.error(f"An unexpected error occurred during Google Search: {e}", exc_info=True)
-        return "An unexpected error occurred while trying to search the web."
\ No newline at end of file
+    except httpx.HTTPError as e:
+        logger.error("Google Search request failed: %s", e)
+        return "An error occurred while searching the web."
+    except ValueError as e:
+        # An oversized body, or one that isn't valid JSON (orjson.JSONDecodeError is a ValueError).
+        logger.error("Could not read the Google Search response: %s", e)
+        return "An error occurred while reading the search results."
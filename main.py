@@ -1,12 +1,18 @@
 # main.py
 import logging
+from contextlib import asynccontextmanager
 import uvicorn
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from typing import Dict
 
 from api.routers.chat import router as chat_router
 from api.routers.predict import router as predict_router
 from api.routers.orchestrate import router as orchestrate_router
+from api.routers.admin import router as admin_router
+from api import session_manager
+from core.cache import close_redis_cache
+from core.tools.web_search import close_search_client, warm_search_client
 
 # --- Logging Configuration ---
 logging.basicConfig(
@@ -16,18 +22,39 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
+# --- Application Lifespan ---
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Verifies that the session store is reachable and starts pre-connecting the
+    outbound search client before serving traffic; on shutdown, releases pooled
+    outbound HTTP and Redis connections.
+    """
+    await session_manager.check_connection()
+    warm_search_client()
+    yield
+    await close_search_client()
+    await close_redis_cache()
+    await session_manager.close_connection()
+    logger.info("Outbound HTTP clients and cache connections closed.")
+
+
 # --- FastAPI Application Initialization ---
 app = FastAPI(
     title="Tennis AI API",
     version="2.2.0", # Final, working version
     description="An API combining a quantitative ML model, a conversational LLM, and an orchestration layer.",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # --- Include API Routers ---
 app.include_router(chat_router)
 app.include_router(predict_router)
 app.include_router(orchestrate_router)
-logger.info("Chat, Prediction, and Orchestration API routers included successfully.")
+app.include_router(admin_router)
+logger.info("Chat, Prediction, Orchestration, and Admin API routers included successfully.")
 
 
 @app.get("/", tags=["Health Check"])
@@ -1,18 +1,22 @@
 # schemas/chat_schemas.py
 import logging
 from typing import List, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 logger = logging.getLogger(__name__)
 
 
 class ChatMessage(BaseModel):
     """Represents a single message in the conversation history."""
+    model_config = ConfigDict(extra='forbid')
+
     role: str = Field(..., examples=["user", "model"])
     content: str
 
 class ChatRequest(BaseModel):
     """Defines the structure for a chat request body."""
+    model_config = ConfigDict(extra='forbid')
+
     query: str = Field(..., min_length=1, max_length=5000)
     session_id: Optional[str] = Field(default=None)
     # The default_factory ensures a new empty list is created if history is not provided.
@@ -20,4 +24,6 @@ class ChatRequest(BaseModel):
 
 class ChatResponse(BaseModel):
     """Defines the structure for a non-streaming chat response body."""
+    model_config = ConfigDict(extra='forbid')
+
     response: str
\ No newline at end of file
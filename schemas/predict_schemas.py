@@ -5,25 +5,31 @@ Defines the Pydantic data models (Data Contracts) for the prediction API.
 By centralizing these models here, we avoid circular import errors and establish
 a single source of truth for the data structures used in the prediction flow.
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Literal
 
 class PlayerData(BaseModel):
     """Defines the clean, internal data structure for a single player."""
-    rank: int = Field(..., example=10)
-    points: int = Field(..., example=3000)
-    age: float | None = Field(None, example=25.5)
-    height: int | None = Field(None, example=185)
-    plays_right_handed: bool | None = Field(None, example=True)
+    model_config = ConfigDict(extra='forbid')
+
+    rank: int = Field(..., examples=[10])
+    points: int = Field(..., examples=[3000])
+    age: float | None = Field(None, examples=[25.5])
+    height: int | None = Field(None, examples=[185])
+    plays_right_handed: bool | None = Field(None, examples=[True])
 
 class MatchData(BaseModel):
     """Defines the clean, internal structure representing a match for prediction."""
+    model_config = ConfigDict(extra='forbid')
+
     player1: PlayerData
     player2: PlayerData
-    surface: Literal['Clay', 'Hard', 'Grass', 'Carpet'] = Field(..., example='Hard')
-    best_of: int = Field(..., example=3)
+    surface: Literal['Clay', 'Hard', 'Grass', 'Carpet'] = Field(..., examples=['Hard'])
+    best_of: int = Field(..., examples=[3])
 
 class PredictionResponse(BaseModel):
     """Defines the structure for the prediction endpoint's response."""
+    model_config = ConfigDict(extra='forbid')
+
     predicted_winner: Literal['Player 1', 'Player 2']
-    p1_win_probability: float = Field(..., example=0.6238)
\ No newline at end of file
+    p1_win_probability: float = Field(..., examples=[0.6238])
\ No newline at end of file